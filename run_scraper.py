@@ -1,4 +1,9 @@
+import base64
+import calendar
 import random
+import threading
+from queue import Queue
+from concurrent.futures import ThreadPoolExecutor
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -8,7 +13,13 @@ import os
 from urllib.parse import quote
 from urllib.parse import urlparse, parse_qs
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
+from collections import Counter, defaultdict
+from functools import lru_cache, wraps
+from itertools import count
+from contextlib import contextmanager
 import pytz
 import re
 from py_appsheet import AppSheetClient
@@ -20,6 +31,81 @@ from proxy_relay import start_proxy_relay
 # variables are provided as real environment/secret values instead).
 load_dotenv()
 
+# One pooled HTTP session for every direct request (AppSheet batch updates,
+# debug image downloads) so keep-alive reuses connections instead of paying a
+# fresh TCP+TLS handshake per call. Transient 429/5xx responses are retried.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+))
+
+# AppSheet credentials and endpoint, read once at import. Missing values are
+# reported by check_appsheet_credentials() when a scrape starts (not at import,
+# so helpers like test_proxy.py can import this module without them).
+APPSHEET_APP_ID = os.environ.get("APPSHEET_APP_ID")
+APPSHEET_APP_KEY = os.environ.get("APPSHEET_APP_KEY")
+APPSHEET_HEADERS = {"ApplicationAccessKey": APPSHEET_APP_KEY}
+APPSHEET_ACTION_URL = f"https://api.appsheet.com/api/v1/apps/{APPSHEET_APP_ID}/tables/{{table}}/Action"
+
+def check_appsheet_credentials():
+    """Fail fast, before any browser starts, if the AppSheet secrets are missing."""
+    missing = [name for name, value in (("APPSHEET_APP_ID", APPSHEET_APP_ID),
+                                        ("APPSHEET_APP_KEY", APPSHEET_APP_KEY)) if not value]
+    if missing:
+        raise RuntimeError(f"Missing AppSheet credentials: {', '.join(missing)}")
+
+# HTTP statuses worth retrying: rate limiting and transient server errors.
+RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+
+# py-appsheet raises a bare Exception("Request failed with status code N") for
+# any non-200 response, so the status has to be read back out of the message.
+_STATUS_IN_ERROR_RE = re.compile(r"status code (\d{3})")
+
+# Helper function to tell transient failures (network errors, retryable HTTP
+# statuses) from permanent ones like a bad key (401/403) or wrong table (404).
+# retry_connection_errors=False is for calls made through SESSION, whose
+# adapter has already retried the connection by the time ConnectionError surfaces.
+def is_retryable_error(e, retry_connection_errors=True):
+    if isinstance(e, requests.ConnectionError):
+        return retry_connection_errors
+    if isinstance(e, requests.RequestException):
+        return True
+    match = _STATUS_IN_ERROR_RE.search(str(e))
+    return bool(match) and int(match.group(1)) in RETRYABLE_STATUS
+
+def with_backoff(max_retries=5, base=1.0, retry_connection_errors=True):
+    """
+    Retry the wrapped AppSheet call on a transient error (see is_retryable_error)
+    or a retryable HTTP response, sleeping base * 2**attempt + jitter between
+    tries (or the server's Retry-After, when given). A transient 429 at the end
+    of a run then costs a few seconds instead of throwing away all the scraping
+    before it.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            for attempt in range(max_retries + 1):
+                delay = base * 2 ** attempt + random.random()
+                try:
+                    result = fn(*args, **kwargs)
+                except Exception as e:
+                    if attempt == max_retries or not is_retryable_error(e, retry_connection_errors):
+                        raise
+                    print(f"⚠️ {fn.__name__} failed ({e}); retrying in {delay:.1f}s...")
+                else:
+                    status = getattr(result, "status_code", None)
+                    if status not in RETRYABLE_STATUS or attempt == max_retries:
+                        return result
+                    retry_after = result.headers.get("Retry-After", "")
+                    if retry_after.isdigit():
+                        delay = float(retry_after)
+                    print(f"⚠️ {fn.__name__} got HTTP {status}; retrying in {delay:.1f}s...")
+                time.sleep(delay)
+        return wrapper
+    return decorator
+
 HEBREW_MONTHS = {
     "ינואר": 1,
     "פברואר": 2,
@@ -35,6 +121,35 @@ HEBREW_MONTHS = {
     "דצמבר": 12
 }
 
+# Regexes used per card / per URL, compiled once at import.
+_URL_RE = re.compile(r'https?://[^\s",\)]+')
+_HEB_STRIP_RE = re.compile(r"ביום\s+|יום\s+|,")
+_HEB_DATE_RE = re.compile(
+    r"(\d{1,2})\s+ב?(" + "|".join(HEBREW_MONTHS) + r")\s+(\d{4})"
+)
+
+# str.translate table for debug filenames: keeps [0-9A-Za-z_.-], maps every
+# other code point to "_". Built lazily per code point, so it also covers
+# non-ASCII (e.g. Hebrew) characters without a 64K-entry table up front.
+class _SafeFilenameTable(dict):
+    _KEEP = frozenset(map(ord, "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_.-"))
+
+    def __missing__(self, code):
+        value = code if code in self._KEEP else ord("_")
+        self[code] = value
+        return value
+
+_SAFE_FN_TABLE = _SafeFilenameTable()
+
+# Poll interval for element waits. Selenium's default 0.5s adds up to half a
+# second after an element has already appeared; each poll is one cheap RPC.
+WAIT_POLL = 0.1
+
+# Wait condition: True once any element matches css. Answered in the browser,
+# so a poll returns a single boolean instead of every matching element.
+def has_elements(css):
+    return lambda d: d.execute_script("return document.querySelector(arguments[0]) !== null;", css)
+
 # Helper function to clean URLs from AppSheet, handling both direct strings and HYPERLINK formulas
 def clean_url(url_data):
     if not url_data: return ""
@@ -44,19 +159,24 @@ def clean_url(url_data):
     str_url = str(url_data)
     if "http" in str_url:
         # Extract everything starting from http until the first " or , or )
-        match = re.search(r'https?://[^\s",\)]+', str_url)
+        match = _URL_RE.search(str_url)
         if match:
             return match.group(0)
             # return match.group(0).rstrip('"').rstrip(')')
     return str_url.strip()
 
+# Helper function to build the AppSheet client once and share it across table reads
+@lru_cache(maxsize=None)
+def get_appsheet_client():
+    return AppSheetClient(
+        app_id=APPSHEET_APP_ID,
+        api_key=APPSHEET_APP_KEY,
+    )
+
 # Helper function to fetch data from AppSheet using py-appsheet
 def get_appsheet_data(table_name):
     """Uses the py-appsheet library to fetch data with the correct arguments."""
-    client = AppSheetClient(
-        app_id=os.environ.get("APPSHEET_APP_ID"),
-        api_key=os.environ.get("APPSHEET_APP_KEY"),
-    )
+    client = get_appsheet_client()
     
     try:
         # Pass None as the 'item' to fetch all rows without a specific search term.
@@ -64,7 +184,7 @@ def get_appsheet_data(table_name):
         # contain at least one empty cell (`"" in row.values()`), silently dropping
         # fully-populated rows. Omitting `item` (defaults to None) returns everything.
         print(f"⏳ Fetching all rows from table: {table_name}")
-        rows = client.find_items(table_name)
+        rows = _find_items(client, table_name)
         
         if rows:
             print(f"✅ Successfully retrieved {len(rows)} rows from {table_name}")
@@ -72,12 +192,24 @@ def get_appsheet_data(table_name):
         else:
             # If still 0 rows, try the most direct call possible
             print(f"⚠️ No rows found in {table_name}. Checking for server-side filter...")
-            return client.find_items(table_name, selector="true")
+            return _find_items(client, table_name, selector="true")
             
     except Exception as e:
         print(f"❌ py-appsheet error: {e}")
         return []
 
+@with_backoff()
+def _find_items(client, table_name, **kwargs):
+    return client.find_items(table_name, **kwargs)
+
+# SESSION's adapter already retries failed connections (Retry(total=3)), so
+# only statuses and read errors are retried here. It doesn't retry statuses for
+# POST, so those don't stack.
+@with_backoff(retry_connection_errors=False)
+def _post_action(url, body):
+    # AppSheet "Edit" rows are keyed by ID, so re-sending a batch is idempotent.
+    return SESSION.post(url, json=body, headers=APPSHEET_HEADERS)
+
 # Main function to determine which shows to scrape based on AppSheet data and return the optimized list of targets
 def get_optimized_targets():
     """
@@ -85,9 +217,13 @@ def get_optimized_targets():
     - global_productions: List of short names to search on Papi/Friends.
     - hall_targets: Dict { "hall_url": ["Short Name 1", ... ] } for specific halls.
     """
-    productions = get_appsheet_data("הפקות")
-    events = get_appsheet_data("אירועי עתיד")
-    halls = get_appsheet_data("אולמות")
+    # The three tables are independent, so fetch them concurrently: one AppSheet
+    # round trip of wall-clock instead of three back to back. The shared client
+    # is built first: lru_cache doesn't serialize a first call, so three threads
+    # racing into get_appsheet_client() could each construct one.
+    get_appsheet_client()
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        productions, events, halls = pool.map(get_appsheet_data, ["הפקות", "אירועי עתיד", "אולמות"])
 
     if not events:
         print("⚠️ No future events found in 'אירועי עתיד'.")
@@ -108,19 +244,25 @@ def get_optimized_targets():
 
     # 1. Create a mapping of Full Production Name -> Short Name
     # (Since events table likely uses the full name)
-    prod_name_to_short = {p.get("שם הפקה מלא"): p.get("שם מקוצר") for p in productions if p.get("שם הפקה מלא")}
+    # Short names are stripped once here so "X" and "X " don't become two searches.
+    prod_name_to_short = {
+        p.get("שם הפקה מלא"): str(p.get("שם מקוצר") or "").strip()
+        for p in productions if p.get("שם הפקה מלא")
+    }
 
     active_production_dates = {} # { "סבא אליעזר": ["14/03/2026", "28/03/2026"] }
 
     for e in events:
         full_name = e.get("הפקה")
-        date = e.get("תאריך") # וודא שזה הפורמט שמופיע באתר (למשל DD/MM/YYYY)
+        date = str(e.get("תאריך") or "").strip() # וודא שזה הפורמט שמופיע באתר (למשל DD/MM/YYYY)
         short = prod_name_to_short.get(full_name)
         if short and date:
             if short not in active_production_dates:
                 active_production_dates[short] = []
             active_production_dates[short].append(date)
 
+    # Several events share a date (matinee + evening); keep each date once, in order
+    active_production_dates = {k: list(dict.fromkeys(v)) for k, v in active_production_dates.items()}
     all_short_names = list(active_production_dates.keys())
     print(f"🎯 Found {len(all_short_names)} active productions with future events.")
 
@@ -180,8 +322,66 @@ def get_proxy_domains():
     raw = os.environ.get("PROXY_DOMAINS", "friends.smarticket.co.il")
     return {d.strip().lower() for d in raw.split(",") if d.strip()}
 
+# Sub-resources the scraper never reads (fonts, media, analytics/ad beacons).
+# Images are handled separately by the block_images Chrome pref. CSS and
+# scripts stay enabled: the Cloudflare widget and the seat map need them.
+BLOCKED_URL_PATTERNS = [
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.mp4", "*.webm", "*.mp3",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*connect.facebook.net*",
+]
+
+# Block fonts/media/trackers via CDP. Best effort, and it must be re-applied
+# after every reconnect (see restore_session_state): the reconnect opens a new
+# DevTools session, which starts with an empty block list.
+def block_heavy_resources(driver):
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        print(f"⚠️ Could not set blocked URLs: {e}")
+
+# Background services Chrome runs for an interactive user. None of them are
+# needed by the scraper and each costs memory/CPU per pooled browser. Kept
+# deliberately conservative: site isolation, extensions and JS stay untouched
+# so UC mode and the Cloudflare checkbox keep behaving as tested.
+CHROMIUM_ARGS = ",".join([
+    "--mute-audio",
+    "--no-first-run",
+    "--disable-sync",
+    "--disable-default-apps",
+    "--disable-background-networking",
+    "--disable-features=Translate",
+])
+
+# Seconds before a navigation is abandoned (doubled for the residential proxy)
+PAGE_LOAD_TIMEOUT = 30
+
+# Selenium's default page-load timeout is 300s, so one hung show page could
+# stall a pool worker for five minutes. Fail it instead; the per-show error
+# handling moves on to the next one. Like the CDP block list, it must be
+# re-applied after every reconnect: the reconnect starts a new WebDriver
+# session, which comes back with chromedriver's default.
+def apply_page_load_timeout(driver):
+    try:
+        driver.set_page_load_timeout(driver.scraper_page_load_timeout)
+    except Exception as e:
+        print(f"⚠️ Could not set page-load timeout: {e}")
+
+# Helper function to re-apply per-session browser settings. Both
+# uc_open_with_reconnect and uc_gui_click_captcha end in driver.reconnect(),
+# which starts a fresh WebDriver/DevTools session without them.
+def restore_session_state(driver):
+    block_heavy_resources(driver)
+    apply_page_load_timeout(driver)
+
+# UC mode patches the shared chromedriver binary on launch, which isn't safe
+# to do concurrently — serialize launches across every pool.
+_LAUNCH_LOCK = threading.Lock()
+_DRIVER_IDS = count(1)  # stable per-browser tokens (id() can be reused after quit)
+
 # 2. Update get_driver to use SeleniumBase UC Mode
-def get_driver(proxy=None, block_images=False):
+def get_driver(proxy=None, block_images=True):
     """
     proxy: local relay address ("127.0.0.1:8899") to route through the Israeli
     residential proxy, or None for a direct connection.
@@ -189,23 +389,69 @@ def get_driver(proxy=None, block_images=False):
     When proxied we set incognito=False: incognito strips extensions, and even
     though the relay avoids the auth-extension problem, keeping a normal (fresh,
     throwaway) UC profile is the configuration proven to work in testing.
-    block_images cuts residential-proxy data usage.
+    block_images cuts page weight (and residential-proxy data usage); the
+    scraper only reads text and the seat-map DOM, so it is on by default.
+    page_load_strategy="eager" makes navigation return at DOMContentLoaded
+    instead of window.load; every read after a navigation already waits
+    explicitly for the element it needs.
     """
-    return Driver(
-        browser="chrome",
-        uc=True,
-        headless=False,  # Set to False so PyAutoGUI/UC can work
-        no_sandbox=True,
-        disable_gpu=True,
-        incognito=(proxy is None),
-        proxy=proxy,
-        block_images=block_images,
-    )
+    with _LAUNCH_LOCK:
+        driver = Driver(
+            browser="chrome",
+            uc=True,
+            headless=False,  # Set to False so PyAutoGUI/UC can work
+            no_sandbox=True,
+            disable_gpu=True,
+            incognito=(proxy is None),
+            proxy=proxy,
+            block_images=block_images,
+            page_load_strategy="eager",
+            chromium_arg=CHROMIUM_ARGS,
+        )
+        driver.scraper_id = next(_DRIVER_IDS)
+    # Remembered on the driver so the timeout can be re-applied after reconnects
+    driver.scraper_page_load_timeout = PAGE_LOAD_TIMEOUT if proxy is None else PAGE_LOAD_TIMEOUT * 2
+    restore_session_state(driver)
+    return driver
+
+# Debug artifacts are written by a background thread so the scraping worker
+# never blocks on disk I/O. Items are (path, bytes); flush_debug() drains them.
+_WRITE_Q = Queue()
+_WRITER_LOCK = threading.Lock()
+_writer_thread = None
+
+def _writer_loop():
+    while True:
+        path, data = _WRITE_Q.get()
+        try:
+            with open(path, "wb", buffering=1 << 20) as f:
+                f.write(data)
+        except Exception as e:
+            print(f"⚠️ Failed writing {path}: {e}")
+        finally:
+            _WRITE_Q.task_done()
+
+def _queue_write(path, data):
+    global _writer_thread
+    with _WRITER_LOCK:
+        if _writer_thread is None:
+            _writer_thread = threading.Thread(target=_writer_loop, daemon=True, name="debug-writer")
+            _writer_thread.start()
+    _WRITE_Q.put((path, data))
+
+def flush_debug():
+    """Block until every queued debug artifact is on disk (call before exit)."""
+    _WRITE_Q.join()
+
+# Image assets are only worth their disk/network cost when debugging locally;
+# the screenshot + HTML uploaded as the CI artifact are enough otherwise.
+DEBUG_SNAPSHOTS = os.environ.get("SCRAPER_DEBUG") == "1"
 
 # Save screenshot for debugging
 def save_debug(driver, show_name, suffix):
     """
-    Save screenshot + page HTML + attempt to download inline images for later offline inspection.
+    Save screenshot + page HTML for later offline inspection. With SCRAPER_DEBUG=1
+    also attempt to download the page's inline images.
     """
     safe_name = show_name.replace(" ", "_").replace("/", "_")
     os.makedirs("screenshots", exist_ok=True)
@@ -214,49 +460,67 @@ def save_debug(driver, show_name, suffix):
     # 1) screenshot
     png_path = f"screenshots/{safe_name}_{suffix}_{ts}.png"
     try:
-        driver.save_screenshot(png_path)
-        print(f"📸 Screenshot saved: {png_path}")
+        _queue_write(png_path, driver.get_screenshot_as_png())
+        print(f"📸 Screenshot queued: {png_path}")
     except Exception as e:
         print(f"⚠️ Failed saving screenshot: {e}")
 
     # 2) save page HTML
     html_path = f"screenshots/{safe_name}_{suffix}_{ts}.html"
     try:
-        html = driver.page_source
-        with open(html_path, "w", encoding="utf-8") as f:
-            f.write(html)
-        print(f"🗂️ HTML saved: {html_path}")
+        _queue_write(html_path, driver.page_source.encode("utf-8"))
+        print(f"🗂️ HTML queued: {html_path}")
     except Exception as e:
         print(f"⚠️ Failed saving HTML: {e}")
 
-    # 3) attempt to download images referenced in the page (may be blocked by site)
+    if not DEBUG_SNAPSHOTS:
+        return
+
+    # 3) save images referenced in the page. The browser already holds them, so
+    # read the bytes over CDP instead of downloading them again; only images CDP
+    # can't return (e.g. evicted from the resource tree) fall back to HTTP.
     try:
         asset_dir = f"screenshots/{safe_name}_{suffix}_{ts}_assets"
         os.makedirs(asset_dir, exist_ok=True)
-        imgs = driver.find_elements(By.TAG_NAME, "img")
-        downloaded = 0
-        for i, img in enumerate(imgs):
+        # every <img> src in one round trip instead of a get_attribute per image
+        srcs = driver.execute_script("return Array.from(document.images).map(i => i.src);")
+        targets = {}  # dest path -> src URL (also dedupes repeated images)
+        for i, src in enumerate(srcs):
             try:
-                src = img.get_attribute("src")
                 if not src:
                     continue
                 # make filename from URL
                 parsed = urlparse(src)
                 filename = os.path.basename(parsed.path) or f"img_{i}.bin"
                 # avoid query params in filename
-                filename = re.sub(r'[^0-9A-Za-z_.-]', '_', filename)
+                filename = filename.translate(_SAFE_FN_TABLE)
                 dest = os.path.join(asset_dir, filename)
                 # avoid re-downloading same file
-                if os.path.exists(dest):
+                if os.path.exists(dest) or dest in targets:
                     continue
-                # download with requests (honor absolute URLs)
-                resp = requests.get(src, timeout=15)
-                if resp.status_code == 200:
-                    with open(dest, "wb") as fh:
-                        fh.write(resp.content)
-                    downloaded += 1
+                targets[dest] = src
             except Exception:
                 continue
+
+        try:
+            frame_id = driver.execute_cdp_cmd("Page.getResourceTree", {})["frameTree"]["frame"]["id"]
+        except Exception:
+            frame_id = None
+
+        downloaded = 0
+        fallback = []
+        for dest, src in targets.items():
+            content = _read_cached_resource(driver, frame_id, src) if frame_id else None
+            if content:
+                _queue_write(dest, content)
+                downloaded += 1
+            else:
+                fallback.append((src, dest))
+
+        if fallback:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                downloaded += sum(pool.map(lambda t: _download_asset(*t), fallback))
+
         if downloaded:
             print(f"🖼️ Downloaded {downloaded} images to {asset_dir}")
         else:
@@ -264,7 +528,34 @@ def save_debug(driver, show_name, suffix):
     except Exception as e:
         print(f"⚠️ Error while saving assets: {e}")
 
+# Read a resource the browser already loaded (bytes), or None if CDP doesn't have it
+def _read_cached_resource(driver, frame_id, url):
+    try:
+        result = driver.execute_cdp_cmd("Page.getResourceContent", {"frameId": frame_id, "url": url})
+    except Exception:
+        return None
+    content = result.get("content")
+    if not content:
+        return None
+    if result.get("base64Encoded"):
+        return base64.b64decode(content)
+    return content.encode("utf-8")
+
+# Download one image over HTTP and queue it for dest; returns True on success
+def _download_asset(src, dest):
+    try:
+        # download with requests (honor absolute URLs)
+        resp = SESSION.get(src, timeout=15)
+        if resp.status_code == 200:
+            _queue_write(dest, resp.content)  # same writer as every other artifact
+            return True
+    except Exception:
+        pass
+    return False
+
 # Parse Hebrew date string
+# Memoized: every search repeats the same handful of show dates across cards.
+@lru_cache(maxsize=4096)
 def parse_hebrew_date(date_str):
     """
     Convert Hebrew date strings like:
@@ -277,22 +568,21 @@ def parse_hebrew_date(date_str):
     try:
         # ניקוי רווחים כפולים ותווים מוזרים
         clean = " ".join(date_str.split())
-        clean = re.sub(r"ביום\s+|יום\s+|,", "", clean).strip()
+        clean = _HEB_STRIP_RE.sub("", clean).strip()
 
         # Extract numeric day, month (with optional prefix ב), and year
-        match = re.search(r"(\d{1,2})\s+ב?([א-ת]+)\s+(\d{4})", clean)
+        match = _HEB_DATE_RE.search(clean)
         if not match:
             return "" 
 
+        # The month alternation only matches known names, so no lookup miss
         day = int(match.group(1))
-        month_name = match.group(2)
-        year = int(match.group(3))
-
-        month = HEBREW_MONTHS.get(month_name)
-        if not month:
+        month = HEBREW_MONTHS[match.group(2)]
+        year = match.group(3)
+        # Reject dates that don't exist (e.g. 31 בפברואר), as datetime() would
+        if not 1 <= day <= calendar.monthrange(int(year), month)[1]:
             return ""
-
-        return datetime(year, month, day).strftime("%d/%m/%Y")
+        return f"{day:02d}/{month:02d}/{year}"
 
     except Exception as e:
         print(f"⚠️ Failed to parse date '{date_str}': {e}")
@@ -307,7 +597,7 @@ def ensure_event_page(driver):
     if "?id=" not in driver.current_url:
         try:
             # Wait for the table listing dates to appear
-            WebDriverWait(driver, 5).until(
+            WebDriverWait(driver, 5, poll_frequency=WAIT_POLL).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".table-responsive table, a.btn-danger"))
             )
             
@@ -319,7 +609,7 @@ def ensure_event_page(driver):
                 driver.execute_script("arguments[0].click();", order_buttons[0])
                 
                 # Wait for the specific event container to load
-                WebDriverWait(driver, 10).until(
+                WebDriverWait(driver, 10, poll_frequency=WAIT_POLL).until(
                     EC.presence_of_element_located((By.CSS_SELECTOR, "div.show_details"))
                 )
                 return True
@@ -336,16 +626,20 @@ def select_area(driver):
     """
 
     try:
-        # Wait up to 5 sec for the areas table (if not found → no area selection)
-        rows = WebDriverWait(driver, 5).until(
-            EC.presence_of_all_elements_located(
-                (By.CSS_SELECTOR, "table.areas tr.area")
-            )
+        # Wait up to 5 sec for either the areas table or the seat map itself —
+        # most shows go straight to the seat map, and waiting only for the areas
+        # table would burn the full 5 sec on every one of them.
+        WebDriverWait(driver, 5, poll_frequency=WAIT_POLL).until(
+            has_elements("table.areas tr.area, table.chair_map td a.chair")
         )
     except:
         # No area table → continue normally
         return
 
+    rows = driver.find_elements(By.CSS_SELECTOR, "table.areas tr.area")
+    if not rows:
+        return
+
     # Try to click specifically the "אולם"
     for row in rows:
         cols = row.find_elements(By.TAG_NAME, "td")
@@ -365,6 +659,13 @@ def select_area(driver):
     driver.execute_script("arguments[0].click();", first_button)
     print("🟦 Selected first area (fallback)")
     
+# [empty-seat count] once the seat map has any chair, else null. Wrapped in a
+# list so a sold-out map (0 empty) is still truthy for WebDriverWait.
+_EMPTY_SEATS_JS = """
+if (!document.querySelector('table.chair_map td a.chair')) return null;
+return [document.querySelectorAll('table.chair_map td a.chair.empty').length];
+"""
+
 # Count empty seats in the chair_map table
 def count_empty_seats(driver, timeout=10):
     """
@@ -382,21 +683,39 @@ def count_empty_seats(driver, timeout=10):
         # Wait until the seat-map table itself renders (any chair present), rather than
         # waiting specifically for empty chairs. A sold-out show has zero empty chairs,
         # so the old wait would burn the full timeout and log a false error every time.
-        WebDriverWait(driver, timeout).until(
-            lambda d: d.find_elements(By.CSS_SELECTOR, "table.chair_map td a.chair")
+        # One script per poll returns just the count, instead of shipping a
+        # reference to every chair element over the WebDriver protocol.
+        empty_seats = WebDriverWait(driver, timeout, poll_frequency=WAIT_POLL).until(
+            lambda d: d.execute_script(_EMPTY_SEATS_JS)
         )
-        empty_seats = driver.find_elements(By.CSS_SELECTOR, "table.chair_map td a.chair.empty")
-        return len(empty_seats)
+        return empty_seats[0]
     except Exception as e:
         print(f"❌ Error counting empty seats: {e}")
         return None
 
+# Date Format Guesser: AppSheet might send YYYY-MM-DD or MM/DD/YYYY.
+# Memoized: many rows share a date, so each distinct string is parsed once.
+@lru_cache(maxsize=4096)
+def _parse_appsheet_date(raw):
+    for fmt in ("%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y"):
+        try:
+            return datetime.strptime(raw, fmt).date()
+        except (TypeError, ValueError):
+            continue
+    return None
+
+# Scraped dates are always DD/MM/YYYY (from parse_hebrew_date); the same few
+# dates repeat across every show, so each is parsed once.
+@lru_cache(maxsize=4096)
+def _parse_scraped_date(raw):
+    try:
+        return datetime.strptime(raw, "%d/%m/%Y").date()
+    except (TypeError, ValueError):
+        return None
+
 # Step 3: Update AppSheet with the new availability data using the matched IDs
 def update_appsheet_batch(shows):
     """Matches scraped shows to AppSheet rows using ID and updates them."""
-    app_id = os.environ.get("APPSHEET_APP_ID")
-    app_key = os.environ.get("APPSHEET_APP_KEY")
-
     # 1. Fetch current data to find the IDs
     print("⏳ Fetching current AppSheet data to match IDs...")
     current_rows = get_appsheet_data("הופעות עתידיות")
@@ -407,11 +726,25 @@ def update_appsheet_batch(shows):
 
     exclude_words = ["סוואנה", "אפריקה", "הפקת הענק"]
 
+    # Index the AppSheet rows once by (date, organization). Each scraped show is
+    # then compared only against the few rows on its own date and org, instead of
+    # re-scanning (and re-parsing the date of) every row for every show. Each
+    # entry carries the row's pre-normalized production name alongside the row.
+    rows_by_date_org = defaultdict(list)
+    for row in current_rows:
+        app_date_obj = _parse_appsheet_date(row.get("תאריך"))
+        if app_date_obj is None: continue
+
+        row_org = (row.get("ארגון") or "").strip()
+        # `or ""` guards against a present-but-None value (key exists, value is None),
+        # which would make .strip() raise AttributeError.
+        app_row_name = (row.get("הפקה") or "").strip().lower()
+        rows_by_date_org[(app_date_obj, row_org)].append((app_row_name, row))
+
     updates = []
     for show in shows:
-        try:
-            scraped_date_obj = datetime.strptime(show["date"], "%d/%m/%Y").date()
-        except:
+        scraped_date_obj = _parse_scraped_date(show["date"])
+        if scraped_date_obj is None:
             continue
 
         scraped_name = show["name"].strip()
@@ -444,40 +777,24 @@ def update_appsheet_batch(shows):
         else:
             org_value = "אולם"
 
-        # 2. Find the ID in AppSheet that matches this show
-        match = None
-        for row in current_rows:
-            app_date_raw = row.get("תאריך")
-            # `or ""` guards against a present-but-None value (key exists, value is None),
-            # which would make .strip() raise AttributeError.
-            app_row_name = (row.get("הפקה") or "").strip().lower()
-
-            # Date Format Guesser: AppSheet might send YYYY-MM-DD or MM/DD/YYYY
-            app_date_obj = None
-            for fmt in ("%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y"):
-                try:
-                    app_date_obj = datetime.strptime(app_date_raw, fmt).date()
-                    break
-                except: continue
+        short_name_lower = short_name.lower()
 
-            if app_date_obj != scraped_date_obj: continue
+        # 2. Find the ID in AppSheet that matches this show. Date and Org are
+        # already matched by the index, so only the name is compared here.
+        # The exclude-word rule depends only on the scraped name, so it's decided
+        # once per show rather than once per candidate row.
+        excluded = ("סימבה" in clean_scraped_name or "פיטר פן" in clean_scraped_name) and \
+                   any(word in clean_scraped_name for word in exclude_words)
 
-            # Comparison (Name + Date + Org)
-            row_org = (row.get("ארגון") or "").strip()
+        match = None
+        if not excluded:
+            for app_row_name, row in rows_by_date_org.get((scraped_date_obj, org_value), []):
+                name_match = (short_name_lower in app_row_name) or \
+                             (app_row_name in short_name_lower)
 
-            name_match = (short_name.lower() in app_row_name) or \
-                         (app_row_name in short_name.lower())
-            
-            if "סימבה" in clean_scraped_name or "פיטר פן" in clean_scraped_name:
-                if any(word in clean_scraped_name for word in exclude_words):
-                    name_match = False
-
-            # Match by Name, Date, and Organization
-            if (name_match) and \
-            app_date_obj == scraped_date_obj and \
-            row_org == org_value:
-                match = row
-                break
+                if name_match:
+                    match = row
+                    break
         
         if not match:
             print(f"❌ No AppSheet match for: {scraped_name} vs {short_name} on {scraped_date_obj} ({org_value})")
@@ -505,25 +822,34 @@ def update_appsheet_batch(shows):
     
     # 3. Send Batch Edit to AppSheet
     if updates:
-        num_updates = len(updates)
+        flush_updates(updates)
+    else:
+        print("❌ No matching rows found in AppSheet.")
 
-        url = f"https://api.appsheet.com/api/v1/apps/{app_id}/tables/כרטיסים/Action"
+# Send the prepared 'כרטיסים' edits to AppSheet in fixed-size chunks
+def flush_updates(updates, chunk=500):
+    """
+    One Edit action per `chunk` rows: a single request for a normal run, while a
+    very large batch is split so no request exceeds AppSheet's payload limits.
+    """
+    url = APPSHEET_ACTION_URL.format(table="כרטיסים")
+
+    for start in range(0, len(updates), chunk):
+        rows = updates[start:start + chunk]
         body = {
             "Action": "Edit",
             "Properties": {
             "Locale": "en-US",
             "Timezone": "Israel Standard Time"
             },
-            "Rows": updates
+            "Rows": rows
         }
-        resp = requests.post(url, json=body, headers={"ApplicationAccessKey": app_key})
+        resp = _post_action(url, body)
         print(f"🚀 AppSheet Batch Update Status: {resp.status_code}")
-        print(f"✅ Successfully updated {num_updates} rows in the 'כרטיסים' table.")
-        if resp.status_code != 200:
-            print(f"🚀 AppSheet Batch Update Status: {resp.status_code}")
+        if resp.status_code == 200:
+            print(f"✅ Successfully updated {len(rows)} rows in the 'כרטיסים' table.")
+        else:
             print(f"❌ AppSheet Update Error: {resp.text}")
-    else:
-        print("❌ No matching rows found in AppSheet.")
 
 # Detect a Cloudflare "Just a moment" interstitial via the page title.
 def is_cloudflare_challenge(driver):
@@ -534,22 +860,41 @@ def is_cloudflare_challenge(driver):
     return "Just a moment" in title or "Checking your browser" in title
 
 
+# uc_gui_click_captcha moves the real (PyAutoGUI) mouse; serialize it across workers.
+_GUI_CLICK_LOCK = threading.Lock()
+
+# Max seconds to wait for the challenge to clear after each click (the old fixed sleep).
+CLOUDFLARE_SETTLE_TIMEOUT = 4
+
 # Try to clear a Cloudflare challenge using SeleniumBase UC mode.
 def clear_cloudflare(driver, attempts=3):
     """
     Re-checks the page after each click instead of assuming a single attempt worked.
     Without this, the caller can fall through to a false 'No results' while the
     challenge is still resolving. Returns True if the challenge appears cleared.
+
+    After a click we wait on the page title (same ~4s budget as the old fixed
+    sleep) so a fast solve returns immediately instead of idling.
     """
     for attempt in range(1, attempts + 1):
         if not is_cloudflare_challenge(driver):
             return True
         print(f"🛡️ Cloudflare detected (attempt {attempt}/{attempts}), attempting bypass...")
         try:
-            driver.uc_gui_click_captcha()
+            # The GUI click drives the one shared (Xvfb) mouse/screen, so only
+            # one worker may click at a time when several browsers are open.
+            with _GUI_CLICK_LOCK:
+                driver.uc_gui_click_captcha()
         except Exception as e:
             print(f"⚠️ Captcha click attempt failed: {e}")
-        time.sleep(4)
+        restore_session_state(driver)  # the click ends in a reconnect too
+        try:
+            WebDriverWait(driver, CLOUDFLARE_SETTLE_TIMEOUT, poll_frequency=0.5).until(
+                lambda d: not is_cloudflare_challenge(d)
+            )
+            return True
+        except TimeoutException:
+            pass  # still challenged — next attempt clicks again
 
     if is_cloudflare_challenge(driver):
         print("❌ Could not clear Cloudflare challenge after retries.")
@@ -557,6 +902,98 @@ def clear_cloudflare(driver, attempts=3):
     return True
 
 
+# Cloudflare clearance is per browser, so without sharing every worker in the
+# pool solves its own challenge for the same host. After one worker clears a
+# challenge its cookies are stored here by host, and the other workers are
+# seeded with them before their next search on that host.
+_SITE_COOKIES = {}            # host -> (version, cookies) from the last cleared challenge
+_SEEDED = set()               # (driver.scraper_id, host, version) already injected
+_CHALLENGE_COUNTS = Counter() # host -> challenges seen (logged at the end of a run)
+_SITE_COOKIES_LOCK = threading.Lock()
+
+# Only Cloudflare's own cookies are shared. The site's session cookies stay
+# with the browser that earned them, since the workers search concurrently.
+_SHARED_COOKIE_NAMES = ("cf_clearance", "__cf_bm")
+
+def share_site_cookies(driver, host):
+    try:
+        cookies = [c for c in driver.get_cookies() if c.get("name") in _SHARED_COOKIE_NAMES]
+    except Exception as e:
+        print(f"⚠️ Could not read cookies for {host}: {e}")
+        return
+    if any(c.get("name") == "cf_clearance" for c in cookies):
+        with _SITE_COOKIES_LOCK:
+            version = _SITE_COOKIES.get(host, (0, None))[0] + 1
+            _SITE_COOKIES[host] = (version, cookies)
+            _SEEDED.add((driver.scraper_id, host, version))
+
+# Helper function to check whether a cached cf_clearance is (about to be) expired
+def clearance_expired(cookies, margin=30):
+    for c in cookies:
+        if c.get("name") == "cf_clearance" and "expiry" in c:
+            return time.time() >= c["expiry"] - margin
+    return False
+
+def seed_site_cookies(driver, host):
+    # Network.setCookie writes straight into the browser's cookie store, so
+    # no extra navigation to the host is needed before injecting.
+    with _SITE_COOKIES_LOCK:
+        version, cookies = _SITE_COOKIES.get(host, (0, None))
+        if cookies and clearance_expired(cookies):
+            # Seeding a stale clearance would only trigger a fresh challenge;
+            # drop the cookies so the next driver that clears one re-populates
+            # the cache. The version is kept so the fresh clearance gets a new
+            # one and still reaches drivers already marked in _SEEDED.
+            _SITE_COOKIES[host] = (version, None)
+            return
+        key = (driver.scraper_id, host, version)
+        if not cookies or key in _SEEDED:
+            return
+        _SEEDED.add(key)
+    for c in cookies:
+        params = {
+            "name": c["name"],
+            "value": c["value"],
+            "domain": c.get("domain", host),
+            "path": c.get("path", "/"),
+            "secure": c.get("secure", False),
+            "httpOnly": c.get("httpOnly", False),
+        }
+        if c.get("sameSite") in ("Strict", "Lax", "None"):
+            params["sameSite"] = c["sameSite"]
+        if "expiry" in c:
+            params["expires"] = c["expiry"]
+        try:
+            driver.execute_cdp_cmd("Network.setCookie", params)
+        except Exception as e:
+            print(f"⚠️ Could not seed cookie {c['name']} for {host}: {e}")
+            return
+
+# Reads every field of the search-result cards (a.show) in a single WebDriver
+# round trip. With no argument it returns a list for every card on the page;
+# given one card element it returns a one-item list. Missing parts are null.
+_CARD_FIELDS_JS = """
+const cards = arguments[0] ? [arguments[0]] : Array.from(document.querySelectorAll('a.show'));
+return cards.map((card) => {
+    const text = (sel) => { const el = card.querySelector(sel); return el ? el.innerText : null; };
+    return {
+        date: text('.date_container'),
+        name: text('h2'),
+        hall: text('.theater_container'),
+        time: text('.time_container'),
+        href: card.href,
+    };
+});
+"""
+
+# [number of result cards, whether the viewport has reached the page bottom]
+_SCROLL_STATE_JS = """
+return [
+    document.querySelectorAll('a.show').length,
+    window.innerHeight + window.scrollY >= document.documentElement.scrollHeight - 2,
+];
+"""
+
 # Main function to run the search logic for a given site and search term, returning found shows with availability
 def run_search_logic(driver, base_url, search_term, site_tag, active_dates_map, card_wait=7, empty_retries=0):
     """
@@ -578,6 +1015,7 @@ def run_search_logic(driver, base_url, search_term, site_tag, active_dates_map,
 
     # 1. Construct and visit the search URL
     search_url = f"{base_url}search?q={quote(search_term)}"
+    host = (urlparse(base_url).hostname or "").lower()
     print(f"🔍 Navigating to: {search_url}")
 
     try:
@@ -586,20 +1024,23 @@ def run_search_logic(driver, base_url, search_term, site_tag, active_dates_map,
         for attempt in range(empty_retries + 1):
             time.sleep(random.uniform(2, 4)) # Add a tiny human-like delay
             # UC Mode navigation: This handles the 'Just a moment' challenge automatically
+            seed_site_cookies(driver, host)  # reuse another worker's clearance
             driver.uc_open_with_reconnect(search_url, reconnect_time=10)
+            restore_session_state(driver)  # reconnect dropped the block list + timeouts
 
             # Clear Cloudflare if present (retries + re-verification so we don't
             # mistake an unsolved challenge for an empty result set).
-            clear_cloudflare(driver)
-
-            print("📜 Scrolling to load all cards...")
-            for _ in range(4): # 4 גלילות קטנות
-                driver.execute_script("window.scrollBy(0, 800);")
-                time.sleep(1)
-
+            if is_cloudflare_challenge(driver):
+                with _SITE_COOKIES_LOCK:
+                    _CHALLENGE_COUNTS[host] += 1
+                if clear_cloudflare(driver):
+                    share_site_cookies(driver, host)
+
+            # Wait for the first result card as the "page is ready" sentinel; it
+            # returns as soon as the results AJAX lands instead of after fixed sleeps.
             try:
-                WebDriverWait(driver, card_wait).until(
-                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, "a.show"))
+                WebDriverWait(driver, card_wait, poll_frequency=WAIT_POLL).until(
+                    has_elements("a.show")
                 )
                 cards_found = True
                 break
@@ -612,6 +1053,24 @@ def run_search_logic(driver, base_url, search_term, site_tag, active_dates_map,
         if not cards_found:
             return []
 
+        # Scroll to load any remaining cards, stopping early once we're at the
+        # bottom of the page and the last scroll brought in no new cards.
+        print("📜 Scrolling to load all cards...")
+        card_count, _ = driver.execute_script(_SCROLL_STATE_JS)
+        for _ in range(4): # עד 4 גלילות קטנות
+            driver.execute_script("window.scrollBy(0, 800);")
+            # Up to 1s for lazy-loaded cards, moving on as soon as new ones land
+            try:
+                WebDriverWait(driver, 1, poll_frequency=WAIT_POLL).until(
+                    lambda d: d.execute_script(_SCROLL_STATE_JS)[0] > card_count
+                )
+            except TimeoutException:
+                pass
+            new_count, at_bottom = driver.execute_script(_SCROLL_STATE_JS)
+            if at_bottom and new_count == card_count:
+                break
+            card_count = new_count
+
         valid_dates = active_dates_map.get(search_term, [])
         normalized_valid_dates = []
         for d in valid_dates:
@@ -624,31 +1083,41 @@ def run_search_logic(driver, base_url, search_term, site_tag, active_dates_map,
 
         print(f"🎯 Target dates for '{search_term}': {normalized_valid_dates}")
         
-        show_cards = driver.find_elements(By.CSS_SELECTOR, "a.show")
-        total = len(show_cards)
+        # חילוץ נתונים ישירות מהכרטיסיות (ה-HTML ששלחת) — every card in one round trip
+        cards_data = driver.execute_script(_CARD_FIELDS_JS)
+        total = len(cards_data)
         print(f"🔍 Found {total} show cards for '{search_term}' before date filtering.")
 
         # שמירת לינקים ונתונים שצריך לבדוק מושבים עבורם
         to_process = []
+        show_cards = None  # element handles, only fetched if a card needs a re-read
         
-        for i, card in enumerate(show_cards):
+        for i, card_data in enumerate(cards_data):
             try:
-                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", card)
-                time.sleep(0.2)
-
-                # חילוץ נתונים ישירות מהכרטיסייה (ה-HTML ששלחת)
-                raw_date = driver.execute_script("return arguments[0].querySelector('.date_container').innerText;", card).strip()
-                full_name = driver.execute_script("return arguments[0].querySelector('h2').innerText;", card).strip()
+                raw_date = (card_data["date"] or "").strip()
+                full_name = (card_data["name"] or "").strip()
                 
                 parsed_date = parse_hebrew_date(raw_date)
 
                 print(f"   [{i+1}/{total}] Card Name: '{full_name}' | Date: '{parsed_date}'")
 
                 if not parsed_date or not full_name:
-                    # אם עדיין ריק, ננסה גלילה קטנה לאלמנט הספציפי
-                    driver.execute_script("arguments[0].scrollIntoView();", card)
-                    raw_date = driver.execute_script("return arguments[0].querySelector('.date_container').innerText;", card).strip()
-                    full_name = driver.execute_script("return arguments[0].querySelector('h2').innerText;", card).strip()
+                    # אם עדיין ריק, נגלול לאלמנט הספציפי וננסה שוב
+                    if show_cards is None:
+                        show_cards = driver.find_elements(By.CSS_SELECTOR, "a.show")
+                    card = show_cards[i]
+                    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", card)
+
+                    def card_filled(d):
+                        data = d.execute_script(_CARD_FIELDS_JS, card)[0]
+                        return data if data["date"] and data["name"] else False
+
+                    try:
+                        card_data = WebDriverWait(driver, 1, poll_frequency=WAIT_POLL).until(card_filled)
+                    except TimeoutException:
+                        card_data = driver.execute_script(_CARD_FIELDS_JS, card)[0]
+                    raw_date = (card_data["date"] or "").strip()
+                    full_name = (card_data["name"] or "").strip()
                     parsed_date = parse_hebrew_date(raw_date)
                 
                 # אם התאריך לא ברשימה שלנו - מדלגים מיד בלי להיכנס ללינק!
@@ -658,12 +1127,12 @@ def run_search_logic(driver, base_url, search_term, site_tag, active_dates_map,
                 else:
                      print(f"🎯 Date {parsed_date} is a target! Processing this show.")
                     
-                # אם עברנו את הסינון, נאסוף את שאר הנתונים מהכרטיסייה
-                hall = driver.execute_script("return arguments[0].querySelector('.theater_container').innerText;", card).strip().replace("(מפת הגעה)", "")
-                time_val = driver.execute_script("return arguments[0].querySelector('.time_container').innerText;", card).replace("בשעה", "").strip()
+                # אם עברנו את הסינון, נשתמש בשאר הנתונים מהכרטיסייה
+                hall = (card_data["hall"] or "").strip().replace("(מפת הגעה)", "")
+                time_val = (card_data["time"] or "").replace("בשעה", "").strip()
 
                 show_info = {
-                    "url": card.get_attribute("href"),
+                    "url": card_data["href"],
                     "name": full_name,
                     "hall": hall,
                     "date": parsed_date,
@@ -704,12 +1173,88 @@ def run_search_logic(driver, base_url, search_term, site_tag, active_dates_map,
 
     return found_shows
 
+# Number of browsers each pass runs in parallel. Searches are IO-bound (page
+# loads, Cloudflare, AJAX), so a few browsers overlap most of the waiting.
+# Overridable via the SCRAPER_WORKERS env var (e.g. 1 to debug sequentially).
+def get_worker_count():
+    try:
+        return max(1, int(os.environ.get("SCRAPER_WORKERS", "3")))
+    except ValueError:
+        return 3
+
+# A fixed set of pre-launched browsers that worker threads borrow one at a time.
+class DriverPool:
+    """
+    Each driver is an independent WebDriver session, so threads never share
+    Selenium state: borrow() hands a driver to exactly one thread and takes it
+    back when that thread is done with it.
+    """
+
+    def __init__(self, size, **driver_kwargs):
+        # Launched one at a time (see _LAUNCH_LOCK in get_driver).
+        self._driver_kwargs = driver_kwargs
+        self._lock = threading.Lock()
+        self.drivers = []
+        try:
+            for _ in range(size):
+                self.drivers.append(get_driver(**driver_kwargs))
+        except Exception:
+            self.close()  # don't leak the browsers that did start
+            raise
+        self._free = Queue()
+        for d in self.drivers:
+            self._free.put(d)
+
+    @property
+    def size(self):
+        return len(self.drivers)
+
+    @contextmanager
+    def borrow(self):
+        driver = self._free.get()
+        try:
+            yield driver
+        finally:
+            self._free.put(self._recycle_if_dead(driver))
+
+    def _recycle_if_dead(self, driver):
+        # run_search_logic swallows its own errors, so a crashed browser would
+        # otherwise turn every later search on this slot into "No results".
+        try:
+            driver.current_url
+            return driver
+        except Exception as e:
+            print(f"♻️ Browser session died ({e.__class__.__name__}); launching a replacement...")
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        try:
+            replacement = get_driver(**self._driver_kwargs)
+        except Exception as e:
+            print(f"⚠️ Failed to relaunch browser: {e}")
+            return driver
+        with self._lock:
+            self.drivers[self.drivers.index(driver)] = replacement
+        return replacement
+
+    def close(self):
+        with self._lock:
+            drivers = list(self.drivers)
+        for d in drivers:
+            try:
+                d.quit()
+            except Exception as e:
+                print(f"⚠️ Failed closing browser: {e}")
+
 # Main orchestrator function to scrape all targets and update AppSheet
 def scrape_everything():
+    check_appsheet_credentials()
     short_names, hall_targets, active_dates_map = get_optimized_targets()
     all_results = []
 
     proxy_domains = get_proxy_domains()
+    workers = get_worker_count()
 
     def needs_proxy(url):
         return (urlparse(url).hostname or "").lower() in proxy_domains
@@ -728,45 +1273,80 @@ def scrape_everything():
     direct_work = [w for w in work if not needs_proxy(w[0])]
     proxied_work = [w for w in work if needs_proxy(w[0])]
 
-    def run_targets(driver, targets, card_wait=7, empty_retries=0):
+    def run_targets(pool, targets, card_wait=7, empty_retries=0):
+        """
+        Fan the (url, name) searches out across the pool's browsers. Each search
+        is almost entirely waiting on the remote site, so N drivers cut the
+        wall-clock from sum-of-waits to roughly sum/N.
+        """
         for url, tab, names in targets:
             label = f"Aggregator: {tab}" if tab != "Hall" else f"Hall: {url}"
-            print(f"🌐 Scraping {label}")
-            for name in names:
-                all_results.extend(
-                    run_search_logic(driver, url, name, tab, active_dates_map, card_wait, empty_retries)
-                )
+            print(f"🌐 Queued {label} ({len(names)} searches)")
+        tasks = [(url, tab, name) for url, tab, names in targets for name in names]
+
+        def task(url, tab, name):
+            with pool.borrow() as driver:
+                return run_search_logic(driver, url, name, tab, active_dates_map, card_wait, empty_retries)
+
+        results = []
+        with ThreadPoolExecutor(max_workers=pool.size) as executor:
+            futures = [executor.submit(task, *t) for t in tasks]
+            for f in futures:
+                results.extend(f.result())
+        return results
+
+    # Resolve the proxy up front: without credentials the blocked targets run
+    # on the direct browsers too, instead of cold-starting a second identical set.
+    proxy_address = start_proxy_relay() if proxied_work else None
+    if proxied_work and not proxy_address:
+        print("⚠️ Proxy credentials not set (PROXY_USERNAME/PROXY_PASSWORD). "
+              "Running blocked target(s) WITHOUT proxy — they may be blocked.")
+
+    # Bigger card-wait for the blocked targets: residential-proxy latency delays
+    # the results AJAX, so a 7s wait misreads slow loads as "No results".
+    # empty_retries=1: the rotating residential IP occasionally returns an
+    # empty page; one retry gets a fresh IP and recovers it.
+    proxied_kwargs = {"card_wait": 25, "empty_retries": 1}
 
     # --- DIRECT DRIVER: everything not behind the datacenter-IP block ---
-    driver = get_driver()
-    try:
-        run_targets(driver, direct_work)
-    finally:
-        print("🏁 Direct pass finished. Closing browser.")
-        driver.quit()
+    def direct_pass():
+        results = []
+        pool = DriverPool(workers)
+        try:
+            results += run_targets(pool, direct_work)
+            if proxied_work and not proxy_address:
+                results += run_targets(pool, proxied_work, **proxied_kwargs)
+        finally:
+            print("🏁 Direct pass finished. Closing browsers.")
+            pool.close()
+        return results
 
     # --- PROXIED DRIVER: Cloudflare-blocked domains via IL residential proxy ---
     # A separate driver instance because SeleniumBase fixes the proxy at launch
     # time — it can't be switched mid-session.
-    if proxied_work:
-        proxy_address = start_proxy_relay()
-        if proxy_address:
-            hosts = ", ".join(sorted(proxy_domains))
-            print(f"🇮🇱 Routing {len(proxied_work)} target(s) [{hosts}] through residential proxy at {proxy_address}")
-            proxied_driver = get_driver(proxy=proxy_address, block_images=True)
-        else:
-            print("⚠️ Proxy credentials not set (PROXY_USERNAME/PROXY_PASSWORD). "
-                  "Running blocked target(s) WITHOUT proxy — they may be blocked.")
-            proxied_driver = get_driver()
+    def proxied_pass():
+        hosts = ", ".join(sorted(proxy_domains))
+        print(f"🇮🇱 Routing {len(proxied_work)} target(s) [{hosts}] through residential proxy at {proxy_address}")
+        proxied_pool = DriverPool(workers, proxy=proxy_address, block_images=True)
         try:
-            # Bigger card-wait: residential-proxy latency delays the results
-            # AJAX, so a 7s wait misreads slow loads as "No results".
-            # empty_retries=1: the rotating residential IP occasionally returns an
-            # empty page; one retry gets a fresh IP and recovers it.
-            run_targets(proxied_driver, proxied_work, card_wait=25, empty_retries=1)
+            return run_targets(proxied_pool, proxied_work, **proxied_kwargs)
         finally:
-            print("🏁 Proxied pass finished. Closing browser.")
-            proxied_driver.quit()
+            print("🏁 Proxied pass finished. Closing browsers.")
+            proxied_pool.close()
+
+    # The two passes use separate browsers and hit different hosts, so run them
+    # side by side. Results are still combined direct-first, as before.
+    passes = [direct_pass]
+    if proxied_work and proxy_address:
+        passes.append(proxied_pass)
+    with ThreadPoolExecutor(max_workers=len(passes)) as executor:
+        futures = [executor.submit(p) for p in passes]
+        for f in futures:
+            all_results.extend(f.result())
+
+    if _CHALLENGE_COUNTS:
+        counts = ", ".join(f"{h}: {n}" for h, n in sorted(_CHALLENGE_COUNTS.items()))
+        print(f"🛡️ Cloudflare challenges per site: {counts}")
 
     # --- BATCH UPDATE ---
     if all_results:
@@ -776,4 +1356,7 @@ def scrape_everything():
 
 # Main entry point
 if __name__ == "__main__":
-    scrape_everything()
+    try:
+        scrape_everything()
+    finally:
+        flush_debug()